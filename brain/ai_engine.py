@@ -1,11 +1,60 @@
 import json
 import logging
 import time
-from typing import Optional, Any, Dict
-from pydantic import BaseModel, ValidationError, Field
+from collections import OrderedDict
+from string import Template
+from typing import Optional, Any, Dict, Iterator
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, Field
+
+try:
+    import orjson  # optional: Rust JSON encoder, much faster on large recon dicts
+except ImportError:
+    orjson = None
+
+
+def _dump_json(data: Any) -> str:
+    """Serialize data to a JSON string, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, default=str)
+
+
+def _compact_recon(obj: Any, max_str: int = 200, max_items: int = 20) -> Any:
+    """
+    Recursively bound string lengths and collection sizes so large recon blobs
+    (raw nmap banners etc.) don't bloat prompt tokens; elided content is marked
+    with an explicit "...(N more)" suffix.
+    """
+    if isinstance(obj, str):
+        if len(obj) > max_str:
+            return obj[:max_str] + f"...({len(obj) - max_str} more)"
+        return obj
+    if isinstance(obj, dict):
+        out = {}
+        for i, (k, v) in enumerate(obj.items()):
+            if i >= max_items:
+                out["..."] = f"({len(obj) - max_items} more keys)"
+                break
+            out[k] = _compact_recon(v, max_str, max_items)
+        return out
+    if isinstance(obj, (list, tuple)):
+        items = [_compact_recon(v, max_str, max_items) for v in obj[:max_items]]
+        if len(obj) > max_items:
+            items.append(f"...({len(obj) - max_items} more)")
+        return items
+    return obj
+
+
+def _stable_key(data: Any) -> Any:
+    """Key-ordered serialization of data, usable as a cache key."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, sort_keys=True, default=str)
 
 # --- Strategy schema (strict) ---
 class StrategySchema(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)  # do not allow unexpected keys
+
     module: str
     payload: str
     options: Dict[str, Any] = Field(default_factory=dict)
@@ -14,37 +63,129 @@ class StrategySchema(BaseModel):
     manual_review: Optional[bool] = False
     confidence: Optional[float] = None  # optional numeric confidence 0..1
 
-    class Config:
-        extra = "forbid"  # do not allow unexpected keys
+
+# Built once at import time so validation reuses the compiled pydantic-core schema
+_STRATEGY_ADAPTER = TypeAdapter(StrategySchema)
 
 # --- Helper: extract first balanced JSON object from text (safer than greedy regex) ---
-def extract_first_json(text: str) -> Optional[str]:
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _raw_decode_first(text: str) -> Optional[tuple]:
+    """
+    Find and decode the first complete JSON object in text.
+    Returns (obj, start, end) or None if no decodable object exists.
+    """
     if not text:
         return None
-    start = text.find('{')
-    if start == -1:
-        return None
-    depth = 0
-    in_string = False
-    escape = False
-    for i in range(start, len(text)):
-        ch = text[i]
-        if ch == '"' and not escape:
-            in_string = not in_string
-        if in_string and ch == '\\' and not escape:
-            escape = True
-            continue
-        else:
-            escape = False
-        if not in_string:
-            if ch == '{':
-                depth += 1
-            elif ch == '}':
-                depth -= 1
-                if depth == 0:
-                    return text[start:i+1]
+    idx = text.find('{')
+    while idx != -1:
+        try:
+            obj, end = _JSON_DECODER.raw_decode(text, idx)
+            return obj, idx, end
+        except json.JSONDecodeError:
+            idx = text.find('{', idx + 1)
     return None
 
+
+def extract_first_json(text: str) -> Optional[str]:
+    """
+    Return the first complete JSON object embedded in text, or None.
+
+    Delegates scanning to json.JSONDecoder.raw_decode (C-accelerated) instead of
+    walking the string character by character in Python: try to decode from each
+    '{' candidate and advance to the next one on failure.
+    """
+    found = _raw_decode_first(text)
+    if found is None:
+        return None
+    _obj, start, end = found
+    return text[start:end]
+
+
+def extract_first_json_obj(text: str) -> Optional[Any]:
+    """
+    Like extract_first_json but returns the parsed object directly, so callers
+    avoid a second full parse of the extracted substring.
+    """
+    found = _raw_decode_first(text)
+    return found[0] if found is not None else None
+
+
+class _IncrementalJSONScanner:
+    """
+    Tracks brace depth across streamed text chunks and reports as soon as the
+    first balanced {...} object is complete, so callers can stop consuming a
+    token stream without waiting for trailing output.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Feed the next chunk; returns the complete JSON object text once the
+        first balanced object closes, otherwise None.
+
+        The scan jumps between structural characters with str.find (C-level run
+        skipping) rather than stepping the interpreter over every character.
+        """
+        if not chunk:
+            return None
+        self._buf += chunk
+        buf = self._buf
+        i = self._pos
+        n = len(buf)
+        while i < n:
+            if self._in_string:
+                q = buf.find('"', i)
+                if q == -1:
+                    i = n
+                    break
+                # quote is escaped iff preceded by an odd run of backslashes
+                b = q - 1
+                while b >= 0 and buf[b] == '\\':
+                    b -= 1
+                if (q - 1 - b) % 2 == 0:
+                    self._in_string = False
+                i = q + 1
+                continue
+            if self._start == -1:
+                o = buf.find('{', i)
+                if o == -1:
+                    i = n
+                    break
+                self._start = o
+                self._depth = 1
+                i = o + 1
+                continue
+            # inside the object, outside strings: jump to the next structural char
+            j = min((k for k in (buf.find('"', i), buf.find('{', i), buf.find('}', i)) if k != -1), default=-1)
+            if j == -1:
+                i = n
+                break
+            ch = buf[j]
+            if ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos = j + 1
+                    # reset so a rejected candidate doesn't anchor every later
+                    # emission at the stale start; the next feed() scans for a
+                    # fresh opening brace from _pos
+                    start, self._start = self._start, -1
+                    return buf[start:j + 1]
+            i = j + 1
+        self._pos = i
+        return None
+
 # --- LLM adapter: abstracts client, adds retries/backoff and deterministic config ---
 class LLMAdapter:
     def __init__(self, model_name: str = "dolphin-llama3", retries: int = 2, backoff: float = 1.0, timeout: int = 15):
@@ -75,32 +216,76 @@ class LLMAdapter:
                 time.sleep(self.backoff * attempt)
         raise RuntimeError("LLM predict failed after retries")
 
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Yield completion chunks incrementally. Falls back to a single blocking
+        predict() when the underlying client has no streaming API. Retries only
+        apply before the first chunk is yielded; a stream broken mid-way is
+        surfaced to the caller rather than replayed (to avoid duplicate text).
+        """
+        if not self.client:
+            raise RuntimeError("LLM client not initialized")
+        stream_fn = getattr(self.client, "stream", None)
+        if stream_fn is None:
+            yield self.predict(prompt)
+            return
+        attempt = 0
+        while True:
+            yielded = False
+            try:
+                for chunk in stream_fn(prompt):
+                    # chat-style clients yield message objects; plain LLMs yield str
+                    text = chunk if isinstance(chunk, str) else getattr(chunk, "content", str(chunk))
+                    yielded = True
+                    yield text
+                return
+            except Exception as e:
+                if yielded:
+                    raise
+                attempt += 1
+                self.logger.warning("LLM stream failed (attempt %d/%d): %s", attempt, self.retries, e)
+                if attempt > self.retries:
+                    raise RuntimeError("LLM stream failed after retries")
+                time.sleep(self.backoff * attempt)
+
 # --- AI Engine: uses adapter, validates outputs, returns robust strategy object or manual_review hint ---
 class AIEngine:
+    # Static schema example serialized once at class-body time; the prompt preamble
+    # never changes between calls, so only the recon payload is encoded per request.
+    _SCHEMA_EXAMPLE = {
+        "module": "exploit/path",
+        "payload": "payload/path",
+        "options": {},
+        "vector": "system | web",
+        "rationale": "short explanation (optional)"
+    }
+    _PROMPT_PREFIX = (
+        "You are an assistant that ONLY outputs a single JSON object (no surrounding text, no markdown).\n"
+        "Return a JSON object matching this schema: module (string), payload (string), options (object), "
+        "vector (either 'system' or 'web'), rationale (optional string).\n"
+        "If you cannot safely propose an actionable strategy, return {\"manual_review\": true, \"rationale\": \"<reason>\"}.\n"
+        "Do NOT include any shell commands, code execution, or additional commentary.\n\n"
+        f"SCHEMA_EXAMPLE: {json.dumps(_SCHEMA_EXAMPLE)}\n\n"
+        "Recon: "
+    )
+    _PROMPT_SUFFIX = "\n\nRespond ONLY with the JSON object."
+    # Template compiled once; $-substitution avoids escaping the literal JSON
+    # braces the preamble contains (str.format would require doubling them all)
+    _PROMPT_TEMPLATE = Template(_PROMPT_PREFIX + "$recon" + _PROMPT_SUFFIX)
+
+    _STRATEGY_CACHE_MAX = 128
+
     def __init__(self, model_name: str = "dolphin-llama3", llm_adapter: Optional[LLMAdapter] = None):
         self.logger = logging.getLogger("AIEngine")
         self.llm = llm_adapter or LLMAdapter(model_name=model_name)
+        # LRU of validated strategies keyed by a stable recon serialization;
+        # rescans/retries with identical recon skip the LLM call entirely.
+        self._strategy_cache: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
 
     def _build_prompt(self, recon_data: Any) -> str:
-        # Keep prompt strict and explicit: request JSON only, schema and allowed values
-        schema_example = {
-            "module": "exploit/path",
-            "payload": "payload/path",
-            "options": {},
-            "vector": "system | web",
-            "rationale": "short explanation (optional)"
-        }
-        prompt = (
-            "You are an assistant that ONLY outputs a single JSON object (no surrounding text, no markdown).\n"
-            "Return a JSON object matching this schema: module (string), payload (string), options (object), "
-            "vector (either 'system' or 'web'), rationale (optional string).\n"
-            "If you cannot safely propose an actionable strategy, return {\"manual_review\": true, \"rationale\": \"<reason>\"}.\n"
-            "Do NOT include any shell commands, code execution, or additional commentary.\n\n"
-            f"SCHEMA_EXAMPLE: {json.dumps(schema_example)}\n\n"
-            f"Recon: {json.dumps(recon_data, default=str)}\n\n"
-            "Respond ONLY with the JSON object."
-        )
-        return prompt
+        # Only the variable recon tail is serialized per call; the preamble is
+        # cached and the recon tree is bounded before encoding.
+        return self._PROMPT_TEMPLATE.substitute(recon=_dump_json(_compact_recon(recon_data)))
 
     def get_strategy(self, recon_data: Any, require_manual_approval: bool = False) -> Dict[str, Any]:
         """
@@ -108,42 +293,97 @@ class AIEngine:
           - Valid strategy: keys per StrategySchema
           - Manual review: {"manual_review": True, "rationale": "..."}
         """
+        try:
+            cache_key = (_stable_key(recon_data), require_manual_approval)
+        except Exception:
+            cache_key = None
+        if cache_key is not None:
+            cached = self._strategy_cache.get(cache_key)
+            if cached is not None:
+                self._strategy_cache.move_to_end(cache_key)
+                self.logger.debug("Strategy cache hit; skipping LLM call")
+                return dict(cached)
+
         prompt = self._build_prompt(recon_data)
 
+        # Stream tokens and stop as soon as the first balanced JSON object closes,
+        # instead of blocking on the full completion (trailing prose is never needed).
+        parts = []
+        obj = None   # validated strategy dict
+        data = None  # parsed-but-unvalidated dict (manual_review / fallback path)
+        validation_error = None
+        scanner = _IncrementalJSONScanner()
         try:
-            raw = self.llm.predict(prompt)
-            self.logger.debug("LLM raw response: %s", raw)
-        except Exception as e:
+            gen = self.llm.stream(prompt)
+            try:
+                for chunk in gen:
+                    parts.append(chunk)
+                    jtext = scanner.feed(chunk)
+                    if jtext is None:
+                        continue
+                    if '"manual_review"' in jtext:
+                        # manual-review objects carry free-form rationale; parse loosely
+                        try:
+                            data = json.loads(jtext)
+                        except json.JSONDecodeError:
+                            self.logger.debug("Balanced braces were not valid JSON; continuing stream")
+                            continue
+                        break
+                    try:
+                        # single pass: pydantic-core parses and validates the raw text
+                        obj = _STRATEGY_ADAPTER.validate_json(jtext).model_dump()
+                        break
+                    except ValidationError as e:
+                        if any(err.get("type") == "json_invalid" for err in e.errors()):
+                            self.logger.debug("Balanced braces were not valid JSON; continuing stream")
+                            continue
+                        validation_error = e
+                        break
+            finally:
+                gen.close()
+        except Exception:
             self.logger.exception("LLM prediction failed")
             return {"manual_review": True, "rationale": "LLM unavailable or prediction error"}
 
-        # Extract first JSON object safely
-        jtext = extract_first_json(raw)
-        if not jtext:
-            self.logger.error("No JSON object found in LLM response")
-            return {"manual_review": True, "rationale": "LLM did not return JSON"}
+        raw = "".join(parts)
+        self.logger.debug("LLM raw response: %s", raw)
 
-        try:
-            data = json.loads(jtext)
-        except json.JSONDecodeError as e:
-            self.logger.error("JSON decode error from LLM output: %s", e)
-            return {"manual_review": True, "rationale": "Invalid JSON from LLM"}
+        if validation_error is not None:
+            self.logger.error("Strategy validation failed: %s", validation_error)
+            return {"manual_review": True, "rationale": f"ValidationError: {validation_error}"}
 
-        # If the model explicitly requested manual review, pass that through
-        if isinstance(data, dict) and data.get("manual_review"):
-            return {"manual_review": True, "rationale": data.get("rationale", "LLM signaled manual review")}
+        if obj is None:
+            if data is None:
+                # stream ended without a complete object; fall back to a full-text scan
+                data = extract_first_json_obj(raw)
+            if data is None:
+                if '{' not in raw:
+                    self.logger.error("No JSON object found in LLM response")
+                    return {"manual_review": True, "rationale": "LLM did not return JSON"}
+                self.logger.error("No decodable JSON object in LLM output")
+                return {"manual_review": True, "rationale": "Invalid JSON from LLM"}
 
-        # Validate structure strictly with pydantic
-        try:
-            strat = StrategySchema(**data)
-            obj = strat.dict()
-            # enforce allowed vector values
-            if obj["vector"] not in ("system", "web"):
-                self.logger.error("LLM returned invalid vector: %s", obj["vector"])
-                return {"manual_review": True, "rationale": f"Invalid vector: {obj['vector']}"}
-            if require_manual_approval:
-                obj["manual_review"] = True
-            return obj
-        except ValidationError as e:
-            self.logger.error("Strategy validation failed: %s", e)
-            return {"manual_review": True, "rationale": f"ValidationError: {e}"}
+            # If the model explicitly requested manual review, pass that through
+            if isinstance(data, dict) and data.get("manual_review"):
+                return {"manual_review": True, "rationale": data.get("rationale", "LLM signaled manual review")}
+
+            # Validate structure strictly with pydantic
+            try:
+                obj = _STRATEGY_ADAPTER.validate_python(data).model_dump()
+            except ValidationError as e:
+                self.logger.error("Strategy validation failed: %s", e)
+                return {"manual_review": True, "rationale": f"ValidationError: {e}"}
+
+        # enforce allowed vector values
+        if obj["vector"] not in ("system", "web"):
+            self.logger.error("LLM returned invalid vector: %s", obj["vector"])
+            return {"manual_review": True, "rationale": f"Invalid vector: {obj['vector']}"}
+        if require_manual_approval:
+            obj["manual_review"] = True
+        # only successful strategies are cached; manual_review outcomes above
+        # bypass the cache so operators can retry after intervention
+        if cache_key is not None:
+            self._strategy_cache[cache_key] = dict(obj)
+            while len(self._strategy_cache) > self._STRATEGY_CACHE_MAX:
+                self._strategy_cache.popitem(last=False)
+        return obj
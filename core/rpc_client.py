@@ -1,6 +1,9 @@
 import logging
 import time
 from typing import Optional, Any, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
 from pymetasploit3.msfrpc import MsfRpcClient
 
 from core.exceptions import MSFRPCException
@@ -34,6 +37,7 @@ class MSFClient:
         timeout: int = 10,
         connect_retries: int = 1,
         connect_backoff: float = 1.0,
+        health_ttl: float = 5.0,
     ):
         self.password = password
         self.host = host
@@ -43,9 +47,12 @@ class MSFClient:
         self.timeout = int(timeout)
         self.connect_retries = int(connect_retries)
         self.connect_backoff = float(connect_backoff)
+        self.health_ttl = float(health_ttl)
 
         self.client: Optional[MsfRpcClient] = None
         self._connected = False
+        self._last_ok_ts = 0.0
+        self._http: Optional[requests.Session] = None
 
     # ---------------------
     # Connection management
@@ -74,18 +81,47 @@ class MSFClient:
         except Exception as e:
             raise MSFRPCException("Failed to connect to MSF RPC", details={"host": self.host, "port": self.port}, original=e)
 
+    def _make_http_session(self) -> requests.Session:
+        """Build a keep-alive HTTP session so repeated RPC calls reuse pooled connections."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _attach_http_session(self) -> None:
+        """
+        Best-effort: route the RPC client's HTTP traffic through our pooled session.
+        pymetasploit3 versions differ in where (and whether) they keep a
+        requests.Session, so only replace an attribute that already is one.
+        """
+        if not self.client or not self._http:
+            return
+        for attr in ("client", "session"):
+            try:
+                if isinstance(getattr(self.client, attr, None), requests.Session):
+                    setattr(self.client, attr, self._http)
+                    logger.debug("Routed MsfRpcClient.%s through pooled HTTP session", attr)
+                    return
+            except Exception:
+                logger.debug("Failed to attach pooled session via %s", attr, exc_info=True)
+
     def _connect_internal(self) -> bool:
         last_exc = None
         attempt = 0
+        if self._http is None:
+            self._http = self._make_http_session()
         while attempt <= self.connect_retries:
             attempt += 1
             try:
                 logger.info("Connecting to Metasploit RPC at %s:%d (attempt %d)", self.host, self.port, attempt)
                 # Create client
                 self.client = MsfRpcClient(self.password, server=self.host, port=self.port, ssl=self.ssl, user=self.user)
+                self._attach_http_session()
                 # simple health probe (accessing core.version)
                 _ = getattr(self.client.core, "version", None)
                 self._connected = True
+                self._last_ok_ts = time.monotonic()
                 logger.info("Connected to Metasploit RPC")
                 return True
             except Exception as e:
@@ -123,13 +159,25 @@ class MSFClient:
                 except Exception:
                     logger.debug("Optional client cleanup failed", exc_info=True)
 
+            self._close_http_session()
             self.client = None
             self._connected = False
+            self._last_ok_ts = 0.0
             logger.info("MSF client disconnected (best-effort)")
         except Exception as e:
             logger.warning("Error during disconnect: %s", e, exc_info=True)
+            self._close_http_session()
             self.client = None
             self._connected = False
+            self._last_ok_ts = 0.0
+
+    def _close_http_session(self) -> None:
+        if self._http is not None:
+            try:
+                self._http.close()
+            except Exception:
+                logger.debug("HTTP session close failed", exc_info=True)
+            self._http = None
 
     # ---------------------
     # Helpers / health
@@ -141,12 +189,17 @@ class MSFClient:
         """
         Lightweight check that client is responsive.
         Returns True if OK, False otherwise.
+        A probe that succeeded within the last health_ttl seconds is trusted
+        without issuing another RPC round trip.
         """
         if not self.client:
             return False
+        if time.monotonic() - self._last_ok_ts < self.health_ttl:
+            return True
         try:
             # access a lightweight property
             _ = getattr(self.client.core, "version", None)
+            self._last_ok_ts = time.monotonic()
             return True
         except Exception:
             logger.debug("Health check failed", exc_info=True)
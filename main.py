@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import sys
+import inspect
 import logging
 import os
 import argparse
@@ -8,9 +9,10 @@ import time
 import threading
 from enum import Enum
 from getpass import getpass
-from logging.handlers import RotatingFileHandler
-from core.rpc_client import MSFClient
-from core.orchestrator import SpectraOrchestrator
+
+# MSFClient / SpectraOrchestrator are imported inside main() after the
+# --version early exit: their transitive dependencies (RPC stack, parsers)
+# dominate cold start and are pointless for a version check.
 
 __version__ = "0.1.0"
 
@@ -27,18 +29,37 @@ class RunStatus(Enum):
     INTERRUPTED = "interrupted"
     UNKNOWN = "unknown"
 
-def configure_logging(logfile="spectra.log", level=logging.INFO):
+def configure_logging(logfile="spectra.log", level=logging.INFO, console_level=None):
+    import atexit
+    import queue
+    from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
     logger = logging.getLogger()
     logger.setLevel(level)
     fmt = logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
     # console
     ch = logging.StreamHandler()
     ch.setFormatter(fmt)
-    logger.addHandler(ch)
+    if console_level is not None:
+        ch.setLevel(console_level)
     # rotating file
     fh = RotatingFileHandler(logfile, maxBytes=5*1024*1024, backupCount=3)
     fh.setFormatter(fmt)
-    logger.addHandler(fh)
+    # Emitting goes through a queue so a logger.info inside a scan loop is a
+    # cheap enqueue; the listener thread does the blocking stream/file writes.
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, ch, fh, respect_handler_level=True)
+    listener.start()
+    logger.addHandler(QueueHandler(log_queue))
+    # flush and stop the listener on interpreter exit (including sys.exit paths)
+    def _stop_listener():
+        try:
+            listener.stop()
+        except Exception:
+            pass  # already stopped explicitly by the caller
+
+    atexit.register(_stop_listener)
+    return listener
 
 def parse_args():
     p = argparse.ArgumentParser(description="SPECTRA")
@@ -57,6 +78,9 @@ def main():
         print(__version__)
         return
 
+    from core.rpc_client import MSFClient
+    from core.orchestrator import SpectraOrchestrator
+
     configure_logging(level=getattr(logging, args.log_level.upper(), logging.INFO))
     logging.info(BANNER)
 
@@ -91,15 +115,15 @@ def main():
         logging.exception("Error while connecting to MSF RPC")
         sys.exit(4)
 
-    try:
-        # Pass shutdown_event so orchestrator can stop early if implemented to observe it.
-        engine = SpectraOrchestrator(args.target, args.lhost, msf,
-                                     dry_run=args.dry_run, auto_confirm=args.yes,
-                                     shutdown_event=shutdown_event)
-    except TypeError:
-        # backward compatibility if orchestrator doesn't accept shutdown_event yet
-        engine = SpectraOrchestrator(args.target, args.lhost, msf,
-                                     dry_run=args.dry_run, auto_confirm=args.yes)
+    # Pass shutdown_event so orchestrator can stop early if implemented to observe it.
+    # Feature-detect instead of retrying on TypeError: the retry hid genuine
+    # TypeErrors raised inside __init__ behind the compatibility fallback.
+    orch_kwargs = {}
+    if "shutdown_event" in inspect.signature(SpectraOrchestrator).parameters:
+        orch_kwargs["shutdown_event"] = shutdown_event
+    engine = SpectraOrchestrator(args.target, args.lhost, msf,
+                                 dry_run=args.dry_run, auto_confirm=args.yes,
+                                 **orch_kwargs)
 
     try:
         result = engine.run()